@@ -7,21 +7,40 @@ This server: bridges Twilio <-> Deepgram Voice Agent API AND proxies LLM request
 """
 
 import asyncio
-import base64
-import json
+import binascii
 import logging
 import os
 import re
 import secrets
 import shutil
+import socket
+import ssl
 import subprocess
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
 
+import orjson
 from dotenv import load_dotenv
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
 from fastapi.responses import Response, StreamingResponse
 import websockets
 import httpx
 
+try:
+    # SIMD base64 (SSSE3/AVX2/NEON runtime dispatch) — worthwhile at one
+    # encode + one decode per 20 ms audio frame per call.
+    import pybase64
+
+    b64encode_audio = pybase64.b64encode_as_string
+    b64decode_audio = pybase64.b64decode
+except ImportError:
+    # Stdlib fallback: binascii's C paths, skipping the base64-module wrappers.
+    def b64encode_audio(data: bytes) -> str:
+        return binascii.b2a_base64(data, newline=False).decode("ascii")
+
+    b64decode_audio = binascii.a2b_base64
+
 load_dotenv()
 
 logging.basicConfig(
@@ -48,80 +67,191 @@ TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN", "")
 TELNYX_API_KEY = os.getenv("TELNYX_API_KEY", "")
 TELNYX_PUBLIC_KEY = os.getenv("TELNYX_PUBLIC_KEY", "")
 
-# Generate a random proxy secret on startup (Deepgram will send this back to us)
-PROXY_SECRET = os.getenv("PROXY_SECRET", secrets.token_hex(16))
+# Generate a random proxy secret on startup (Deepgram will send this back to
+# us). setdefault publishes a generated secret into the environment so forked
+# uvicorn workers inherit the same value instead of each minting their own.
+PROXY_SECRET = os.environ.setdefault("PROXY_SECRET", secrets.token_hex(16))
 
 DEEPGRAM_AGENT_URL = "wss://agent.deepgram.com/v1/agent/converse"
 
-app = FastAPI(title="deepclaw-voice-agent")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Own the shared HTTP clients for the server's lifetime.
+
+    Keep-alive on the OpenClaw client is stretched to 60 s so the pooled
+    connection survives the gaps between conversation turns instead of
+    re-handshaking on every reply. The gateway is plain HTTP on loopback,
+    so HTTP/2 buys nothing here. The Telnyx client keeps the TLS session
+    to api.telnyx.com warm across calls — answering a call sits on the
+    dial-tone-to-first-word critical path.
+    """
+    app.state.openclaw_client = httpx.AsyncClient(
+        base_url=OPENCLAW_GATEWAY_URL,
+        timeout=httpx.Timeout(60.0, connect=5.0),
+        limits=httpx.Limits(
+            max_connections=100,
+            max_keepalive_connections=20,
+            keepalive_expiry=60.0,
+        ),
+        headers={"Authorization": f"Bearer {OPENCLAW_GATEWAY_TOKEN}"},
+    )
+    app.state.telnyx_client = httpx.AsyncClient(
+        base_url="https://api.telnyx.com",
+        timeout=30.0,
+        headers={"Authorization": f"Bearer {TELNYX_API_KEY}"},
+    )
+    yield
+    await app.state.openclaw_client.aclose()
+    await app.state.telnyx_client.aclose()
+
+
+app = FastAPI(title="deepclaw-voice-agent", lifespan=lifespan)
 
 # Map Deepgram caller IP → OpenClaw session key for the active call.
 # Deepgram sends LLM requests from a fixed IP per call session, so we
 # use the caller IP to correlate proxy requests with the right call.
+# Only mutated through register_session/release_session below; everything
+# runs on the single event loop, so no lock is needed.
 _active_sessions: dict[str, str] = {}
 
+# Safety valve: per-URL entries that miss cleanup (e.g. a crashed handler)
+# must not accumulate forever across long uptimes.
+_MAX_SESSION_ENTRIES = 64
+
+# Reverse index session key → map keys, so teardown is O(entries for this
+# call) instead of a scan over every active session.
+_session_map_keys: dict[str, set[str]] = defaultdict(set)
+
+
+def _evict_session_entry(map_key: str) -> None:
+    session_key = _active_sessions.pop(map_key)
+    keys = _session_map_keys.get(session_key)
+    if keys:
+        keys.discard(map_key)
+        if not keys:
+            del _session_map_keys[session_key]
+
+
+def register_session(public_url: str, session_key: str) -> None:
+    """Register the OpenClaw session key for the active call."""
+    while len(_active_sessions) >= _MAX_SESSION_ENTRIES:
+        _evict_session_entry(next(iter(_active_sessions)))
+    _active_sessions[public_url] = session_key
+    # Deepgram calls us from its cloud IPs — register a catch-all so any
+    # caller hitting /v1/chat/completions during this call gets the right
+    # session.
+    _active_sessions["_current"] = session_key
+    _session_map_keys[session_key].update((public_url, "_current"))
+
+
+def release_session(session_key: str) -> None:
+    """Drop all mappings for a finished call.
 
-async def prewarm_openclaw_session(session_key: str):
+    Entries are only cleared while they still point at this call, so an
+    overlapping newer call that re-registered "_current" is not stomped.
+    """
+    for map_key in _session_map_keys.pop(session_key, ()):
+        if _active_sessions.get(map_key) == session_key:
+            del _active_sessions[map_key]
+
+
+async def prewarm_openclaw_session(client: httpx.AsyncClient, session_key: str):
     """Fire a throwaway request to OpenClaw to warm the session and prompt cache.
 
     This creates the session file, loads skills/tools, and writes the
     Anthropic prompt cache (~15 k tokens).  Subsequent requests in the
     same session hit a warm cache and skip the cold-start penalty.
     """
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {OPENCLAW_GATEWAY_TOKEN}",
-        "X-OpenClaw-Session-Key": session_key,
-    }
+    headers = {"X-OpenClaw-Session-Key": session_key}
     body = {
         "model": "openclaw/voice",
         "stream": True,
         "messages": [{"role": "user", "content": "warmup"}],
     }
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            async with client.stream(
-                "POST",
-                f"{OPENCLAW_GATEWAY_URL}/v1/chat/completions",
-                json=body,
-                headers=headers,
-            ) as response:
-                # Drain the stream so the session completes
-                async for _ in response.aiter_bytes():
-                    pass
+        async with client.stream(
+            "POST",
+            "/v1/chat/completions",
+            json=body,
+            headers=headers,
+            timeout=30.0,
+        ) as response:
+            # Drain the stream so the session completes — aread() pulls the
+            # whole body in large reads instead of waking the task per chunk.
+            await response.aread()
         logger.info("OpenClaw session pre-warmed: %s", session_key)
     except Exception as exc:
         logger.warning("Pre-warm failed (non-fatal): %s", exc)
 
 
+# All markdown constructs fused into one alternation so each SSE delta is
+# scanned once instead of ~13 times. Compiled once at import. Alternation
+# order matters: longer/more specific constructs (code blocks, images,
+# bold, horizontal rules) must come before their shorter prefixes.
+_MD_PATTERN = re.compile(
+    r'(?P<codeblock>```[\s\S]*?```)'
+    r'|`(?P<inlinecode>[^`]+)`'
+    r'|!\[(?P<imagealt>[^\]]*)\]\([^)]+\)'
+    r'|\[(?P<linktext>[^\]]+)\]\([^)]+\)'
+    r'|\*\*(?P<bold>[^*]+)\*\*'
+    r'|\*(?P<italic>[^*]+)\*'
+    r'|__(?P<boldu>[^_]+)__'
+    r'|_(?P<italicu>[^_]+)_'
+    r'|(?P<header>^#{1,6}\s+)'
+    r'|(?P<hrule>^[-*_]{3,}\s*$)'
+    r'|(?P<bullet>^\s*[-*+]\s+)'
+    r'|(?P<numbered>^\s*\d+\.\s+)'
+    r'|(?P<blockquote>^\s*>\s+)'
+    r'|(?P<newlines>\n+)',
+    re.MULTILINE,
+)
+
+# Common emojis (basic set) are deleted via str.translate — a single C-level
+# hash lookup per code point, much cheaper than an astral-plane regex class.
+_EMOJI_TABLE = {
+    codepoint: None
+    for start, end in [
+        (0x1F600, 0x1F64F),
+        (0x1F300, 0x1F5FF),
+        (0x1F680, 0x1F6FF),
+        (0x1F1E0, 0x1F1FF),
+        (0x2702, 0x27B0),
+        (0x1F900, 0x1F9FF),
+    ]
+    for codepoint in range(start, end + 1)
+}
+
+# Groups whose matched content is kept (formatting markers dropped).
+_MD_KEEP_GROUPS = frozenset({'inlinecode', 'linktext', 'bold', 'italic', 'boldu', 'italicu'})
+
+
+def _md_dispatch(match: re.Match) -> str:
+    group = match.lastgroup
+    if group in _MD_KEEP_GROUPS:
+        return match.group(group)
+    if group == 'newlines':
+        # Collapse newline runs into spaces for voice
+        return ' '
+    return ''
+
+
+# Fast path: most streamed deltas are a few plain words with nothing to
+# strip. One cheap character-class scan decides whether the full
+# substitution pass can be skipped entirely.
+_MD_SENTINEL_SEARCH = re.compile(
+    r'[`*_#>!\[\]\n+-]'  # markdown metacharacters
+    r'|^\s*\d+\.'  # numbered-list marker
+    r'|[\u2702-\u27B0\U0001F1E0-\U0001F9FF]',  # superset of _EMOJI_TABLE ranges
+    re.MULTILINE,
+).search
+
+
 def strip_markdown(text: str) -> str:
-    """Strip markdown formatting for voice output."""
-    # Remove code blocks
-    text = re.sub(r'```[\s\S]*?```', '', text)
-    text = re.sub(r'`([^`]+)`', r'\1', text)
-    # Remove bold/italic
-    text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)
-    text = re.sub(r'\*([^*]+)\*', r'\1', text)
-    text = re.sub(r'__([^_]+)__', r'\1', text)
-    text = re.sub(r'_([^_]+)_', r'\1', text)
-    # Remove headers
-    text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
-    # Remove bullet points and numbered lists
-    text = re.sub(r'^\s*[-*+]\s+', '', text, flags=re.MULTILINE)
-    text = re.sub(r'^\s*\d+\.\s+', '', text, flags=re.MULTILINE)
-    # Remove links, keep text
-    text = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)
-    # Remove images
-    text = re.sub(r'!\[([^\]]*)\]\([^)]+\)', '', text)
-    # Remove horizontal rules
-    text = re.sub(r'^[-*_]{3,}\s*$', '', text, flags=re.MULTILINE)
-    # Remove blockquotes
-    text = re.sub(r'^\s*>\s+', '', text, flags=re.MULTILINE)
-    # Remove common emojis (basic set)
-    text = re.sub(r'[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF\U00002702-\U000027B0\U0001F900-\U0001F9FF]+', '', text)
-    # Collapse multiple newlines into spaces for voice
-    text = re.sub(r'\n+', ' ', text)
-    return text
+    """Strip markdown formatting and emojis for voice output."""
+    if _MD_SENTINEL_SEARCH(text) is None:
+        return text
+    return _MD_PATTERN.sub(_md_dispatch, text).translate(_EMOJI_TABLE)
 
 
 # ============================================================================
@@ -136,59 +266,85 @@ async def proxy_chat_completions(request: Request):
     """
     logger.info("LLM proxy request received")
 
-    body = await request.json()
-
-    # Route to the 'voice' agent (configured with claude-haiku-4-5)
-    body["model"] = "openclaw/voice"
+    raw_body = await request.body()
+    body = orjson.loads(raw_body)
 
     stream = body.get("stream", False)
-    logger.info(f"Proxying chat completion - stream={stream}, messages={len(body.get('messages', []))}")
-
-    # Look up the stable session key for this call.
-    # Deepgram's cloud IPs aren't known in advance, so we use
-    # a catch-all that maps to the most recent active call.
-    session_key = _active_sessions.get("_current")
-
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {OPENCLAW_GATEWAY_TOKEN}",
-    }
+    logger.info("Proxying chat completion - stream=%s, messages=%d", stream, len(body.get("messages", [])))
+
+    # Route to the 'voice' agent (configured with claude-haiku-4-5). When
+    # the request already names it, forward the original bytes untouched;
+    # only an actual rewrite pays the re-serialize (orjson either way —
+    # passing json=body would re-encode through stdlib json inside httpx).
+    if body.get("model") == "openclaw/voice":
+        body_bytes = raw_body
+    else:
+        body["model"] = "openclaw/voice"
+        body_bytes = orjson.dumps(body)
+
+    # Deepgram echoes the session-key header configured in the agent
+    # Settings, which identifies the call directly — two overlapping calls
+    # each get their own session. The "_current" catch-all remains as a
+    # fallback for configs sent before this header existed.
+    session_key = request.headers.get(
+        "x-openclaw-session-key"
+    ) or _active_sessions.get("_current")
+
+    headers = {"Content-Type": "application/json"}
     if session_key:
         headers["X-OpenClaw-Session-Key"] = session_key
-        logger.info(f"Using session key: {session_key}")
+        logger.info("Using session key: %s", session_key)
+
+    def rewrite_sse_line(line: bytes) -> bytes:
+        """Strip markdown from a single ``data:`` SSE line, as bytes."""
+        try:
+            data = orjson.loads(line[6:])
+            if 'choices' in data and data['choices']:
+                delta = data['choices'][0].get('delta', {})
+                if 'content' in delta and delta['content']:
+                    delta['content'] = strip_markdown(delta['content'])
+            return b"data: " + orjson.dumps(data)
+        except orjson.JSONDecodeError as exc:
+            logger.warning("Malformed SSE data: %s", exc)
+            return line
 
     async def stream_response():
-        """Stream the response from OpenClaw, stripping markdown for voice."""
+        """Stream the response from OpenClaw, stripping markdown for voice.
+
+        The SSE stream is split on newlines at the byte level. Frames that
+        carry no text delta (roles, finish_reason, keepalives, [DONE]) are
+        forwarded verbatim; only lines that actually contain content are
+        parsed and rewritten.
+        """
         chunk_count = 0
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            async with client.stream(
-                "POST",
-                f"{OPENCLAW_GATEWAY_URL}/v1/chat/completions",
-                json=body,
-                headers=headers,
-            ) as response:
-                async for line in response.aiter_lines():
+        buffer = bytearray()
+        async with request.app.state.openclaw_client.stream(
+            "POST",
+            "/v1/chat/completions",
+            content=body_bytes,
+            headers=headers,
+        ) as response:
+            async for chunk in response.aiter_bytes():
+                buffer += chunk
+                while (newline := buffer.find(b"\n")) >= 0:
+                    line = bytes(buffer[:newline]).rstrip(b"\r")
+                    del buffer[:newline + 1]
                     if not line:
                         continue
                     chunk_count += 1
                     if chunk_count == 1:
                         logger.info("First chunk received from OpenClaw")
 
-                    if line.startswith('data: ') and line != 'data: [DONE]':
-                        try:
-                            data = json.loads(line[6:])
-                            if 'choices' in data and data['choices']:
-                                delta = data['choices'][0].get('delta', {})
-                                if 'content' in delta and delta['content']:
-                                    delta['content'] = strip_markdown(delta['content'])
-                            yield f"data: {json.dumps(data)}\n\n"
-                        except json.JSONDecodeError as exc:
-                            logger.warning("Malformed SSE data: %s", exc)
-                            yield f"{line}\n\n"
-                    elif line.strip():
-                        yield f"{line}\n\n"
-
-                logger.info(f"Stream complete: {chunk_count} chunks")
+                    if line.startswith(b"data: ") and b'"content"' in line:
+                        line = rewrite_sse_line(line)
+                    yield line + b"\n\n"
+
+            # Flush any final line that arrived without a trailing newline
+            line = bytes(buffer).rstrip(b"\r")
+            if line:
+                yield line + b"\n\n"
+
+            logger.info("Stream complete: %d chunks", chunk_count)
 
     if stream:
         return StreamingResponse(
@@ -196,23 +352,32 @@ async def proxy_chat_completions(request: Request):
             media_type="text/event-stream",
         )
     else:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                f"{OPENCLAW_GATEWAY_URL}/v1/chat/completions",
-                json=body,
-                headers=headers,
-            )
-            return Response(
-                content=response.content,
-                status_code=response.status_code,
-                media_type="application/json",
-            )
+        response = await request.app.state.openclaw_client.post(
+            "/v1/chat/completions",
+            content=body_bytes,
+            headers=headers,
+        )
+        return Response(
+            content=response.content,
+            status_code=response.status_code,
+            media_type="application/json",
+        )
 
 
 # ============================================================================
 # Agent Configuration
 # ============================================================================
 
+# Static voice prompt — fixed at process start, so build it once instead of
+# re-embedding the literal in every per-call config dict.
+VOICE_AGENT_PROMPT = (
+    "You are a helpful voice assistant on a phone call. Keep responses "
+    "concise and conversational (1-3 sentences). Never use markdown, "
+    "bullet points, numbered lists, or emojis - your responses will be "
+    "spoken aloud."
+)
+
+
 def get_agent_config(public_url: str) -> dict:
     """Build Deepgram Voice Agent configuration with OpenClaw as custom LLM."""
 
@@ -247,8 +412,14 @@ def get_agent_config(public_url: str) -> dict:
                 },
                 "endpoint": {
                     "url": llm_url,
+                    # Deepgram echoes these headers on every LLM request,
+                    # so the proxy can correlate the request with the call
+                    # directly instead of relying on the global catch-all.
+                    "headers": {
+                        "X-OpenClaw-Session-Key": "__SESSION_KEY__",
+                    },
                 },
-                "prompt": "You are a helpful voice assistant on a phone call. Keep responses concise and conversational (1-3 sentences). Never use markdown, bullet points, numbered lists, or emojis - your responses will be spoken aloud.",
+                "prompt": VOICE_AGENT_PROMPT,
             },
             "speak": {
                 "provider": {
@@ -261,6 +432,150 @@ def get_agent_config(public_url: str) -> dict:
     }
 
 
+# Serialized Settings template, cached per public URL. The config is
+# identical for every call behind the same tunnel host — only llm_url and
+# the session-key header vary — so serialize once and splice the per-call
+# session key into the placeholder. Kept as str: Deepgram requires JSON in
+# text frames (binary frames carry audio).
+_agent_config_cache: dict[str, str] = {}
+
+
+def get_agent_config_json(public_url: str, session_key: str) -> str:
+    """Return the serialized agent config for one call, from a cached template."""
+    template = _agent_config_cache.get(public_url)
+    if template is None:
+        if len(_agent_config_cache) >= 8:
+            # The tunnel host changes at most on restart; don't let a
+            # misbehaving client grow the cache via spoofed Host headers.
+            _agent_config_cache.clear()
+        template = orjson.dumps(get_agent_config(public_url)).decode()
+        _agent_config_cache[public_url] = template
+    # Session keys are built from provider stream/call ids — plain
+    # [A-Za-z0-9:.-], nothing that needs JSON escaping.
+    return template.replace("__SESSION_KEY__", session_key)
+
+
+def enable_tcp_nodelay(ws) -> None:
+    """Disable Nagle's algorithm on an outbound WebSocket connection.
+
+    The bridge pushes ~160-byte mulaw frames every 20 ms; Nagle would hold
+    those sub-MSS segments for the ACK timer and add tens of milliseconds
+    per leg. asyncio and uvloop set TCP_NODELAY on TCP transports by
+    default, but that is a loop-implementation detail — make it explicit
+    for the latency-critical audio leg. (The inbound Twilio/Telnyx side is
+    uvicorn's transport, which gets the same default from the event loop.)
+    """
+    try:
+        sock = ws.transport.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except (AttributeError, OSError) as exc:
+        logger.debug("Could not set TCP_NODELAY: %s", exc)
+
+
+# One SSL context for every Deepgram dial. OpenSSL caches TLS session
+# tickets per context, so reconnects after the first call can resume the
+# session and skip the full ECDHE exchange.
+_dg_ssl_context = ssl.create_default_context()
+
+
+async def _open_deepgram_ws():
+    """Dial the Deepgram Voice Agent API."""
+    ws = await websockets.connect(
+        DEEPGRAM_AGENT_URL,
+        additional_headers={"Authorization": f"Token {DEEPGRAM_API_KEY}"},
+        ssl=_dg_ssl_context,
+        # Don't offer permessage-deflate: the traffic is mulaw audio
+        # (incompressible) and small JSON events, so deflate costs CPU
+        # per frame for nothing. Lift the default 1 MiB cap a little so
+        # a large agent reply can't kill the connection.
+        compression=None,
+        max_size=2**22,
+    )
+    enable_tcp_nodelay(ws)
+    return ws
+
+
+# Pre-warmed Deepgram connections, dialed from the incoming-call webhook so
+# the TLS + WebSocket handshake (~200-400 ms) happens while the phone is
+# still ringing instead of on the media path. Entries older than the TTL
+# are discarded — Deepgram won't sit on an idle unconfigured socket forever.
+_DG_PREWARM_TTL = 10.0
+_dg_prewarmed: list[tuple[float, asyncio.Task]] = []
+
+
+def _sweep_prewarmed(now: float) -> None:
+    """Discard every pooled entry past the TTL.
+
+    Entries are appended in time order, so expired ones sit at the front.
+    Without this sweep, a prewarm never followed by a media connection
+    (caller hung up while ringing, webhook retry) would park its socket
+    in the list forever once a fresher entry shadowed it.
+    """
+    while _dg_prewarmed and now - _dg_prewarmed[0][0] > _DG_PREWARM_TTL:
+        _discard_prewarmed(_dg_prewarmed.pop(0)[1])
+
+
+def prewarm_deepgram_connection() -> None:
+    """Start opening a Deepgram connection ahead of the media stream."""
+    now = time.monotonic()
+    _sweep_prewarmed(now)
+    _dg_prewarmed.append(
+        (now, asyncio.create_task(_open_deepgram_ws(), name="dg-prewarm"))
+    )
+
+
+def _discard_prewarmed(task: asyncio.Task) -> None:
+    """Drop a stale pre-warm task, closing its socket if it connected."""
+    if task.cancel():
+        return
+    if not task.cancelled() and task.exception() is None:
+        asyncio.create_task(task.result().close())
+
+
+async def acquire_deepgram_ws():
+    """Take a pre-warmed Deepgram connection, or dial a fresh one."""
+    _sweep_prewarmed(time.monotonic())
+    while _dg_prewarmed:
+        opened_at, task = _dg_prewarmed.pop()
+        if time.monotonic() - opened_at > _DG_PREWARM_TTL:
+            _discard_prewarmed(task)
+            continue
+        try:
+            return await task
+        except asyncio.CancelledError:
+            # We were cancelled, not the dial — awaiting a Task doesn't
+            # propagate cancellation into it, so discard it explicitly
+            # or its socket would be orphaned with nothing to close it.
+            _discard_prewarmed(task)
+            raise
+        except Exception as exc:
+            logger.warning("Pre-warmed Deepgram connect failed: %s", exc)
+    return await _open_deepgram_ws()
+
+
+# Deepgram control events are logging-only except UserStartedSpeaking,
+# whose barge-in handling is provider-specific and stays inline in each
+# media handler. One dispatch table replaces the if/elif ladder that was
+# duplicated across both handlers.
+_DG_EVENT_LOGGERS = {
+    "Welcome": lambda event: logger.info("Connected to Deepgram Voice Agent"),
+    "SettingsApplied": lambda event: logger.info("Agent settings applied"),
+    "AgentStartedSpeaking": lambda event: logger.debug("Agent started speaking"),
+    "ConversationText": lambda event: logger.info(
+        "%s: %s", event.get("role", "").capitalize(), event.get("content", "")
+    ),
+    "Error": lambda event: logger.error("Deepgram error: %s", event),
+}
+
+
+def log_deepgram_event(event_type: str, event: dict) -> None:
+    """Log a non-barge-in Deepgram control event."""
+    handler = _DG_EVENT_LOGGERS.get(event_type)
+    if handler is not None:
+        handler(event)
+
+
 # ============================================================================
 # Twilio Webhook & Media Stream
 # ============================================================================
@@ -280,9 +595,13 @@ async def twilio_incoming(request: Request):
     Note: For production, add Twilio signature validation:
     https://www.twilio.com/docs/usage/security#validating-requests
     """
+    # Open the Deepgram connection now, hidden behind ringing time, so the
+    # media handler can pick it up without paying the handshake.
+    prewarm_deepgram_connection()
+
     host = request.headers.get("host", "localhost:8000")
     twiml = TWIML_TEMPLATE.format(host=host)
-    logger.info(f"Incoming call, connecting to wss://{host}/twilio/media")
+    logger.info("Incoming call, connecting to wss://%s/twilio/media", host)
     return Response(content=twiml, media_type="application/xml")
 
 
@@ -295,90 +614,113 @@ async def twilio_media_websocket(websocket: WebSocket):
     stream_sid: str | None = None
     session_key: str | None = None
     deepgram_ws = None
-    sender_task = None
     receiver_task = None
     prewarm_task = None
 
-    # Audio buffer for batching
+    # Audio buffer for batching. Buffered audio is forwarded inline from the
+    # receive loop once the threshold fills — one producer, one consumer, no
+    # queue hop or polling task in between.
     audio_buffer = bytearray()
     BUFFER_SIZE = 20 * 160  # 20 messages * 160 bytes = 0.4 seconds at 8kHz mulaw
 
-    async def send_to_deepgram():
-        """Forward buffered audio from Twilio to Deepgram."""
-        nonlocal audio_buffer
-        while True:
-            if len(audio_buffer) >= BUFFER_SIZE and deepgram_ws:
-                chunk = bytes(audio_buffer[:BUFFER_SIZE])
-                audio_buffer = audio_buffer[BUFFER_SIZE:]
-                try:
-                    await deepgram_ws.send(chunk)
-                except Exception as e:
-                    logger.error(f"Error sending to Deepgram: {e}")
-                    break
-            await asyncio.sleep(0.01)
+    async def feed_audio(payload: str):
+        """Decode and buffer caller audio; flush to Deepgram when full."""
+        audio_buffer.extend(b64decode_audio(payload))
+        if len(audio_buffer) >= BUFFER_SIZE and deepgram_ws:
+            chunk = bytes(audio_buffer)
+            audio_buffer.clear()
+            await deepgram_ws.send(chunk)
 
     async def receive_from_deepgram():
         """Receive audio/events from Deepgram and send to Twilio."""
         nonlocal stream_sid
+        # Pre-serialized frame pieces: only the base64 payload varies per
+        # media message, so splice it between constant prefix/suffix and
+        # send one text frame — a single JSON encode and one write() per
+        # packet. (Twilio stream SIDs are plain "MZ..." hex, no escaping.)
+        media_prefix: str | None = None
+        clear_msg: str | None = None
+        # Coalesce Deepgram's TTS chunks so each outbound media message
+        # carries a larger payload — fewer TLS records and syscalls per
+        # second of audio. The 20 ms recv deadline bounds the added
+        # latency; a partial buffer is flushed as soon as audio pauses.
+        out_buf = bytearray()
+        OUT_FLUSH_BYTES = 800  # 100 ms at 8kHz mulaw
+
+        async def flush_audio():
+            payload = b64encode_audio(bytes(out_buf))
+            out_buf.clear()
+            await websocket.send_text(media_prefix + payload + '"}}')
+
         while True:
             try:
-                message = await deepgram_ws.recv()
+                if out_buf:
+                    try:
+                        message = await asyncio.wait_for(
+                            deepgram_ws.recv(), timeout=0.02
+                        )
+                    except asyncio.TimeoutError:
+                        await flush_audio()
+                        continue
+                else:
+                    message = await deepgram_ws.recv()
 
                 # Binary = audio data
                 if isinstance(message, bytes):
                     if stream_sid:
-                        payload = base64.b64encode(message).decode("utf-8")
-                        media_msg = {
-                            "event": "media",
-                            "streamSid": stream_sid,
-                            "media": {"payload": payload},
-                        }
-                        await websocket.send_json(media_msg)
+                        if media_prefix is None:
+                            media_prefix = (
+                                '{"event":"media","streamSid":"'
+                                + stream_sid
+                                + '","media":{"payload":"'
+                            )
+                        out_buf += message
+                        if len(out_buf) >= OUT_FLUSH_BYTES:
+                            await flush_audio()
 
                 # Text = JSON event
                 else:
-                    event = json.loads(message)
+                    # Flush pending audio first so events (notably the
+                    # barge-in clear) never jump ahead of it.
+                    if out_buf:
+                        await flush_audio()
+                    event = orjson.loads(message)
                     event_type = event.get("type", "")
 
-                    if event_type == "Welcome":
-                        logger.info("Connected to Deepgram Voice Agent")
-                    elif event_type == "SettingsApplied":
-                        logger.info("Agent settings applied")
-                    elif event_type == "UserStartedSpeaking":
+                    if event_type == "UserStartedSpeaking":
                         logger.debug("User started speaking")
                         # Clear any queued audio (barge-in)
                         if stream_sid:
-                            await websocket.send_json({
-                                "event": "clear",
-                                "streamSid": stream_sid,
-                            })
-                    elif event_type == "AgentStartedSpeaking":
-                        logger.debug("Agent started speaking")
-                    elif event_type == "ConversationText":
-                        role = event.get("role", "")
-                        content = event.get("content", "")
-                        logger.info(f"{role.capitalize()}: {content}")
-                    elif event_type == "Error":
-                        logger.error(f"Deepgram error: {event}")
+                            if clear_msg is None:
+                                clear_msg = (
+                                    '{"event":"clear","streamSid":"'
+                                    + stream_sid
+                                    + '"}'
+                                )
+                            await websocket.send_text(clear_msg)
+                    else:
+                        log_deepgram_event(event_type, event)
 
             except websockets.exceptions.ConnectionClosed:
                 logger.info("Deepgram connection closed")
                 break
             except Exception as e:
-                logger.error(f"Error receiving from Deepgram: {e}")
+                logger.error("Error receiving from Deepgram: %s", e)
                 break
 
+    dg_connect_task = None
     try:
-        # Connect to Deepgram Voice Agent API
-        deepgram_ws = await websockets.connect(
-            DEEPGRAM_AGENT_URL,
-            additional_headers={"Authorization": f"Token {DEEPGRAM_API_KEY}"},
+        # Pick up the connection pre-warmed by /twilio/incoming (dials a
+        # fresh one if it's missing or stale). Run it as a task so any
+        # residual handshake overlaps Twilio's connected→start exchange
+        # instead of blocking it.
+        dg_connect_task = asyncio.create_task(
+            acquire_deepgram_ws(), name="dg-connect"
         )
-        logger.info("Connected to Deepgram Voice Agent API")
 
         # Wait for stream to start to get the public URL
         while True:
-            message = await websocket.receive_json()
+            message = orjson.loads(await websocket.receive_text())
             event = message.get("event")
 
             if event == "connected":
@@ -391,46 +733,64 @@ async def twilio_media_websocket(websocket: WebSocket):
                 host = websocket.headers.get("host", "localhost:8000")
                 public_url = f"https://{host}"
 
-                logger.info(f"Stream started: {stream_sid}")
-                logger.info(f"Public URL for LLM proxy: {public_url}")
+                logger.info("Stream started: %s", stream_sid)
+                logger.info("Public URL for LLM proxy: %s", public_url)
 
                 # Create a stable session key for this call and register
                 # it so the LLM proxy can find it when Deepgram calls back.
                 session_key = f"agent:voice:call:{stream_sid}"
-                _active_sessions[public_url] = session_key
-                # Deepgram calls us from its cloud IPs — register a
-                # catch-all so any caller hitting /v1/chat/completions
-                # during this call gets the right session.
-                _active_sessions["_current"] = session_key
-                logger.info(f"Session key: {session_key}")
+                register_session(public_url, session_key)
+                logger.info("Session key: %s", session_key)
 
                 # Pre-warm the OpenClaw session in the background so the
                 # prompt cache is hot by the time the user speaks.
                 prewarm_task = asyncio.create_task(
-                    prewarm_openclaw_session(session_key)
+                    prewarm_openclaw_session(
+                        websocket.app.state.openclaw_client, session_key
+                    ),
+                    name="openclaw-prewarm",
                 )
 
-                # Now send agent config with correct URL
-                config = get_agent_config(public_url)
-                await deepgram_ws.send(json.dumps(config))
+                # Collect the (usually already completed) Deepgram
+                # connection and send the agent config
+                deepgram_ws = await dg_connect_task
+                logger.info("Connected to Deepgram Voice Agent API")
+                await deepgram_ws.send(
+                    get_agent_config_json(public_url, session_key)
+                )
                 logger.info("Sent agent config")
 
-                # Start background tasks
-                sender_task = asyncio.create_task(send_to_deepgram())
-                receiver_task = asyncio.create_task(receive_from_deepgram())
+                # Start background task
+                receiver_task = asyncio.create_task(
+                    receive_from_deepgram(), name="rx-deepgram"
+                )
                 break
 
-        # Continue processing Twilio messages
+        # Continue processing Twilio messages. Steady state is one media
+        # frame every 20 ms with a stable JSON shape, so slice the base64
+        # payload out by substring (the base64 alphabet can't contain '"')
+        # instead of building three dicts per packet; control events fall
+        # back to a full parse.
         while True:
-            message = await websocket.receive_json()
+            raw = await websocket.receive_text()
+
+            if raw.startswith('{"event":"media"'):
+                start = raw.find('"payload":"')
+                if start >= 0:
+                    start += len('"payload":"')
+                    payload = raw[start:raw.index('"', start)]
+                    if payload:
+                        await feed_audio(payload)
+                    continue
+
+            message = orjson.loads(raw)
             event = message.get("event")
 
             if event == "media":
-                # Decode and buffer audio
+                # Fast path missed (unexpected key order) — handle anyway
                 payload = message.get("media", {}).get("payload", "")
                 if payload:
-                    audio_data = base64.b64decode(payload)
-                    audio_buffer.extend(audio_data)
+                    await feed_audio(payload)
 
             elif event == "stop":
                 logger.info("Stream stopped")
@@ -439,23 +799,24 @@ async def twilio_media_websocket(websocket: WebSocket):
     except WebSocketDisconnect:
         logger.info("Twilio WebSocket disconnected")
     except Exception as e:
-        logger.error(f"Error in media WebSocket: {e}")
+        logger.error("Error in media WebSocket: %s", e)
     finally:
-        # Cleanup
-        if sender_task:
-            sender_task.cancel()
-        if receiver_task:
-            receiver_task.cancel()
-        if prewarm_task:
-            prewarm_task.cancel()
+        # Cleanup. Await the cancellations before closing the Deepgram
+        # socket so no in-flight send races the close.
+        pending = [t for t in (receiver_task, prewarm_task) if t]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
         if deepgram_ws:
             await deepgram_ws.close()
+        elif dg_connect_task:
+            # Never collected (failed before start) — cancel the dial or
+            # close the socket it produced.
+            _discard_prewarmed(dg_connect_task)
         # Remove session mapping
         if session_key:
-            _active_sessions.pop("_current", None)
-            for k, v in list(_active_sessions.items()):
-                if v == session_key:
-                    del _active_sessions[k]
+            release_session(session_key)
         logger.info("Cleanup complete")
 
 
@@ -463,16 +824,33 @@ async def twilio_media_websocket(websocket: WebSocket):
 # Telnyx Webhook & Media Stream
 # ============================================================================
 
+# Webhook events that only get logged — answered before any nested
+# payload is touched.
+_TELNYX_LOG_ONLY = {
+    "call.answered": "Telnyx call answered",
+    "call.hangup": "Telnyx call ended",
+    "streaming.started": "Telnyx media streaming started",
+    "streaming.stopped": "Telnyx media streaming stopped",
+}
+
+
 @app.post("/telnyx/webhook")
 async def telnyx_webhook(request: Request):
     """Handle Telnyx webhook events - incoming calls and call control."""
-    body = await request.json()
+    body = orjson.loads(await request.body())
     event_type = body.get("data", {}).get("event_type", "")
-    
-    logger.info(f"Telnyx webhook received: {event_type}")
-    
+
+    logger.info("Telnyx webhook received: %s", event_type)
+
+    log_msg = _TELNYX_LOG_ONLY.get(event_type)
+    if log_msg is not None:
+        logger.info(log_msg)
+        return {"status": "ok"}
+
     if event_type == "call.initiated":
-        # Incoming call - answer and start media streaming
+        # Incoming call - answer and start media streaming. Start the
+        # Deepgram handshake now so it overlaps Telnyx's answer flow.
+        prewarm_deepgram_connection()
         call_control_id = body["data"]["payload"]["call_control_id"]
         
         # Get the public URL from the request headers
@@ -485,34 +863,25 @@ async def telnyx_webhook(request: Request):
             "stream_track": "both_tracks"
         }
         
-        headers = {
-            "Authorization": f"Bearer {TELNYX_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"https://api.telnyx.com/v2/calls/{call_control_id}/actions/answer",
-                    json=answer_data,
-                    headers=headers
-                )
-                logger.info(f"Answered Telnyx call: {response.status_code}")
+            response = await request.app.state.telnyx_client.post(
+                f"/v2/calls/{call_control_id}/actions/answer",
+                json=answer_data,
+            )
+            logger.info("Answered Telnyx call: %s", response.status_code)
         except Exception as e:
-            logger.error(f"Error answering Telnyx call: {e}")
-    
-    elif event_type == "call.answered":
-        logger.info("Telnyx call answered")
-    elif event_type == "call.hangup":
-        logger.info("Telnyx call ended")
-    elif event_type == "streaming.started":
-        logger.info("Telnyx media streaming started")
-    elif event_type == "streaming.stopped":
-        logger.info("Telnyx media streaming stopped")
+            logger.error("Error answering Telnyx call: %s", e)
     
     return {"status": "ok"}
 
 
+# Telnyx media envelopes carry no per-call fields, so the frame around the
+# base64 payload is a pair of module-level constants — no dict or JSON
+# encode per flush. Base64 output is pure ASCII, so no escaping is needed.
+_TELNYX_MEDIA_PREFIX = '{"event":"media","media":{"payload":"'
+_TELNYX_MEDIA_SUFFIX = '"}}'
+
+
 @app.websocket("/telnyx/media")
 async def telnyx_media_websocket(websocket: WebSocket):
     """Bridge Telnyx media stream to Deepgram Voice Agent API."""
@@ -520,89 +889,125 @@ async def telnyx_media_websocket(websocket: WebSocket):
     logger.info("Telnyx WebSocket connected")
     
     call_control_id: str | None = None
-    stream_id: str | None = None
     deepgram_ws = None
     sender_task = None
     receiver_task = None
     
-    # Audio buffer for batching
+    # Audio buffer for batching. The receive loop extends it and sets the
+    # event; the sender wakes only when a full chunk is ready — no timer
+    # polling. The cap keeps memory bounded if Deepgram stalls: oldest
+    # audio is dropped first to preserve conversational liveness.
     audio_buffer = bytearray()
+    audio_ready = asyncio.Event()
     BUFFER_SIZE = 20 * 160  # 20 messages * 160 bytes = 0.4 seconds at 8kHz PCMU
-    
+    MAX_BUFFERED_AUDIO = 200 * 160  # ~4 seconds
+
+    dropped_audio_bytes = 0
+
+    def buffer_audio(payload: str):
+        """Decode and buffer caller audio; wake the sender when full."""
+        nonlocal dropped_audio_bytes
+        audio_buffer.extend(b64decode_audio(payload))
+        overflow = len(audio_buffer) - MAX_BUFFERED_AUDIO
+        if overflow > 0:
+            # Log once when a drop episode starts, not per trimmed frame —
+            # a stalled Deepgram socket would otherwise spam 50 lines/sec.
+            if not dropped_audio_bytes:
+                logger.warning("Deepgram slow; dropping oldest buffered audio")
+            dropped_audio_bytes += overflow
+            del audio_buffer[:overflow]
+        if len(audio_buffer) >= BUFFER_SIZE:
+            audio_ready.set()
+
     async def send_to_deepgram():
         """Forward buffered audio from Telnyx to Deepgram."""
-        nonlocal audio_buffer
         while True:
-            if len(audio_buffer) >= BUFFER_SIZE and deepgram_ws:
-                chunk = bytes(audio_buffer[:BUFFER_SIZE])
-                audio_buffer = audio_buffer[BUFFER_SIZE:]
+            await audio_ready.wait()
+            audio_ready.clear()
+            while len(audio_buffer) >= BUFFER_SIZE and deepgram_ws:
+                # Drain any backlog (e.g. after a network hiccup) in one
+                # frame instead of one send per chunk, capped so a large
+                # catch-up write can't monopolize the connection.
+                take = min(len(audio_buffer), 8 * BUFFER_SIZE)
+                chunk = bytes(audio_buffer[:take])
+                del audio_buffer[:take]
                 try:
                     await deepgram_ws.send(chunk)
                 except Exception as e:
-                    logger.error(f"Error sending to Deepgram: {e}")
-                    break
-            await asyncio.sleep(0.01)
+                    logger.error("Error sending to Deepgram: %s", e)
+                    return
     
     async def receive_from_deepgram():
         """Receive audio/events from Deepgram and send to Telnyx."""
-        nonlocal call_control_id
+        # Coalesce TTS chunks into larger media messages, same as the
+        # Twilio handler: flush at the size threshold or after a 20 ms
+        # lull, whichever comes first.
+        out_buf = bytearray()
+        OUT_FLUSH_BYTES = 800  # 100 ms at 8kHz mulaw
+
+        async def flush_audio():
+            payload = b64encode_audio(bytes(out_buf))
+            out_buf.clear()
+            await websocket.send_text(
+                _TELNYX_MEDIA_PREFIX + payload + _TELNYX_MEDIA_SUFFIX
+            )
+
         while True:
             try:
-                message = await deepgram_ws.recv()
-                
+                if out_buf:
+                    try:
+                        message = await asyncio.wait_for(
+                            deepgram_ws.recv(), timeout=0.02
+                        )
+                    except asyncio.TimeoutError:
+                        await flush_audio()
+                        continue
+                else:
+                    message = await deepgram_ws.recv()
+
                 # Binary = audio data
                 if isinstance(message, bytes):
                     if call_control_id:
-                        payload = base64.b64encode(message).decode("utf-8")
-                        media_msg = {
-                            "event": "media",
-                            "media": {"payload": payload}
-                        }
-                        await websocket.send_json(media_msg)
-                
+                        out_buf += message
+                        if len(out_buf) >= OUT_FLUSH_BYTES:
+                            await flush_audio()
+
                 # Text = JSON event
                 else:
-                    event = json.loads(message)
+                    if out_buf:
+                        await flush_audio()
+                    event = orjson.loads(message)
                     event_type = event.get("type", "")
-                    
-                    if event_type == "Welcome":
-                        logger.info("Connected to Deepgram Voice Agent")
-                    elif event_type == "SettingsApplied":
-                        logger.info("Agent settings applied")
-                    elif event_type == "UserStartedSpeaking":
+
+                    if event_type == "UserStartedSpeaking":
                         logger.debug("User started speaking")
                         # Clear any queued audio (barge-in)
                         if call_control_id:
-                            await websocket.send_json({"event": "clear"})
-                    elif event_type == "AgentStartedSpeaking":
-                        logger.debug("Agent started speaking")
-                    elif event_type == "ConversationText":
-                        role = event.get("role", "")
-                        content = event.get("content", "")
-                        logger.info(f"{role.capitalize()}: {content}")
-                    elif event_type == "Error":
-                        logger.error(f"Deepgram error: {event}")
+                            await websocket.send_text('{"event":"clear"}')
+                    else:
+                        log_deepgram_event(event_type, event)
             
             except websockets.exceptions.ConnectionClosed:
                 logger.info("Deepgram connection closed")
                 break
             except Exception as e:
-                logger.error(f"Error receiving from Deepgram: {e}")
+                logger.error("Error receiving from Deepgram: %s", e)
                 break
     
+    dg_connect_task = None
     try:
-        # Connect to Deepgram Voice Agent API
-        deepgram_ws = await websockets.connect(
-            DEEPGRAM_AGENT_URL,
-            additional_headers={"Authorization": f"Token {DEEPGRAM_API_KEY}"},
+        # Dial Deepgram concurrently with the Telnyx connected→start
+        # exchange (picks up a pre-warmed socket from the webhook when
+        # one is available) instead of blocking on the handshake first.
+        dg_connect_task = asyncio.create_task(
+            acquire_deepgram_ws(), name="dg-connect"
         )
-        logger.info("Connected to Deepgram Voice Agent API")
-        
+
         # Wait for stream to start
         while True:
-            message = await websocket.receive_json()
+            message = orjson.loads(await websocket.receive_text())
             event_type = message.get("event")
-            
+
             if event_type == "connected":
                 logger.info("Telnyx media stream connected")
             
@@ -616,22 +1021,35 @@ async def telnyx_media_websocket(websocket: WebSocket):
                 host = websocket.headers.get("host", "localhost:8000")
                 public_url = f"https://{host}"
                 
-                logger.info(f"Telnyx stream started: call_control_id={call_control_id}, stream_id={stream_id}")
-                logger.info(f"Public URL for LLM proxy: {public_url}")
+                logger.info(
+                    "Telnyx stream started: call_control_id=%s, stream_id=%s",
+                    call_control_id, stream_id,
+                )
+                logger.info("Public URL for LLM proxy: %s", public_url)
                 
-                # Send agent config with correct URL
-                config = get_agent_config(public_url)
-                await deepgram_ws.send(json.dumps(config))
+                # Send agent config with correct URL; key the OpenClaw
+                # session off the Telnyx call so the LLM proxy can
+                # correlate requests with this call via the echoed header.
+                session_key = f"agent:voice:call:{call_control_id}"
+                deepgram_ws = await dg_connect_task
+                logger.info("Connected to Deepgram Voice Agent API")
+                await deepgram_ws.send(
+                    get_agent_config_json(public_url, session_key)
+                )
                 logger.info("Sent agent config")
                 
                 # Start background tasks
-                sender_task = asyncio.create_task(send_to_deepgram())
-                receiver_task = asyncio.create_task(receive_from_deepgram())
+                sender_task = asyncio.create_task(
+                    send_to_deepgram(), name="tx-deepgram"
+                )
+                receiver_task = asyncio.create_task(
+                    receive_from_deepgram(), name="rx-deepgram"
+                )
                 break
         
         # Continue processing Telnyx messages
         while True:
-            message = await websocket.receive_json()
+            message = orjson.loads(await websocket.receive_text())
             event_type = message.get("event")
             
             if event_type == "media":
@@ -639,8 +1057,7 @@ async def telnyx_media_websocket(websocket: WebSocket):
                 media_data = message.get("media", {})
                 payload = media_data.get("payload", "")
                 if payload:
-                    audio_data = base64.b64decode(payload)
-                    audio_buffer.extend(audio_data)
+                    buffer_audio(payload)
             
             elif event_type == "stop":
                 logger.info("Telnyx stream stopped")
@@ -649,24 +1066,35 @@ async def telnyx_media_websocket(websocket: WebSocket):
             elif event_type == "dtmf":
                 dtmf_data = message.get("dtmf", {})
                 digit = dtmf_data.get("digit", "")
-                logger.info(f"DTMF received: {digit}")
+                logger.info("DTMF received: %s", digit)
             
             elif event_type == "error":
                 error_data = message.get("payload", {})
-                logger.error(f"Telnyx error: {error_data}")
+                logger.error("Telnyx error: %s", error_data)
     
     except WebSocketDisconnect:
         logger.info("Telnyx WebSocket disconnected")
     except Exception as e:
-        logger.error(f"Error in Telnyx media WebSocket: {e}")
+        logger.error("Error in Telnyx media WebSocket: %s", e)
     finally:
-        # Cleanup
-        if sender_task:
-            sender_task.cancel()
-        if receiver_task:
-            receiver_task.cancel()
+        # Cleanup. Await the cancellations before closing the Deepgram
+        # socket so the sender can't write to a closing connection.
+        pending = [t for t in (sender_task, receiver_task) if t]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
         if deepgram_ws:
             await deepgram_ws.close()
+        elif dg_connect_task:
+            # Never awaited (e.g. Telnyx dropped before "start") — make
+            # sure the dialed socket doesn't leak.
+            _discard_prewarmed(dg_connect_task)
+        if dropped_audio_bytes:
+            logger.warning(
+                "Dropped %.1fs of caller audio this call (Deepgram slow)",
+                dropped_audio_bytes / 8000,
+            )
         logger.info("Telnyx cleanup complete")
 
 
@@ -686,7 +1114,25 @@ def ensure_openclaw_voice_agent():
 
     The voice agent uses a fast model (Haiku by default) to keep
     time-to-first-token low for real-time phone conversations.
+
+    Provisioning state is cached in a marker file so restarts skip the
+    fork+exec of the CLI (hundreds of ms of cold-start) once the agent
+    is known to exist.
     """
+    marker = os.path.join(
+        os.path.expanduser("~"), ".openclaw", ".voice_provisioned"
+    )
+    if os.path.exists(marker):
+        return
+
+    def write_marker():
+        try:
+            os.makedirs(os.path.dirname(marker), exist_ok=True)
+            with open(marker, "w"):
+                pass
+        except OSError as exc:
+            logger.debug("Could not write provisioning marker: %s", exc)
+
     openclaw = shutil.which("openclaw")
     if not openclaw:
         logger.warning(
@@ -705,6 +1151,7 @@ def ensure_openclaw_voice_agent():
         )
         if "voice" in result.stdout.split():
             logger.info("OpenClaw 'voice' agent already exists")
+            write_marker()
             return
     except Exception as exc:
         logger.warning("Could not list OpenClaw agents: %s", exc)
@@ -728,6 +1175,7 @@ def ensure_openclaw_voice_agent():
             capture_output=True, text=True, timeout=15, check=True,
         )
         logger.info("OpenClaw 'voice' agent created successfully")
+        write_marker()
     except subprocess.CalledProcessError as exc:
         logger.warning(
             "Failed to create OpenClaw voice agent: %s\n%s",
@@ -735,43 +1183,63 @@ def ensure_openclaw_voice_agent():
         )
 
 
-def main():
-    """Run the server."""
-    import uvicorn
+def validate_config() -> bool:
+    """Check required configuration once at startup, before serving.
 
-    # Validate required configuration
+    Returns False (after logging what's missing) so a misconfigured
+    server fails fast instead of erroring per request.
+    """
     if not DEEPGRAM_API_KEY:
         logger.error("DEEPGRAM_API_KEY not set. Get one at https://console.deepgram.com/")
-        return
+        return False
     if not OPENCLAW_GATEWAY_TOKEN:
         logger.error("OPENCLAW_GATEWAY_TOKEN not set. Generate with: openssl rand -hex 32")
-        return
-    
+        return False
+
     # Validate voice provider configuration
     if VOICE_PROVIDER == "twilio":
         if not TWILIO_ACCOUNT_SID:
             logger.error("TWILIO_ACCOUNT_SID not set for Twilio provider")
-            return
+            return False
         if not TWILIO_AUTH_TOKEN:
             logger.error("TWILIO_AUTH_TOKEN not set for Twilio provider")
-            return
+            return False
         logger.info("Using Twilio as voice provider")
     elif VOICE_PROVIDER == "telnyx":
         if not TELNYX_API_KEY:
             logger.error("TELNYX_API_KEY not set for Telnyx provider")
-            return
+            return False
         if not TELNYX_PUBLIC_KEY:
             logger.error("TELNYX_PUBLIC_KEY not set for Telnyx provider")
-            return
+            return False
         logger.info("Using Telnyx as voice provider")
     else:
-        logger.error(f"Invalid VOICE_PROVIDER: {VOICE_PROVIDER}. Must be 'twilio' or 'telnyx'")
+        logger.error("Invalid VOICE_PROVIDER: %s. Must be 'twilio' or 'telnyx'", VOICE_PROVIDER)
+        return False
+
+    return True
+
+
+def main():
+    """Run the server."""
+    import uvicorn
+
+    if not validate_config():
         return
 
     ensure_openclaw_voice_agent()
 
-    logger.info(f"Starting deepclaw voice agent server on {HOST}:{PORT}")
-    uvicorn.run(app, host=HOST, port=PORT)
+    # uvicorn[standard] ships uvloop + httptools; request them explicitly
+    # rather than trusting "auto" — uvloop roughly halves per-syscall
+    # overhead on the small WebSocket frames the bridge pushes 50×/sec.
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:  # e.g. Windows
+        loop = "auto"
+
+    logger.info("Starting deepclaw voice agent server on %s:%s", HOST, PORT)
+    uvicorn.run(app, host=HOST, port=PORT, loop=loop, http="httptools")
 
 
 if __name__ == "__main__":